@@ -13,29 +13,93 @@ Handles:
 4. 📘 Finished without review
 """
 
+import argparse
 import re
+import html as html_lib
 import sys
-import math
+import json
+import os
 import time
 import datetime
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import timezone
+from functools import lru_cache
+from itertools import chain
 import feedparser
-from bs4 import BeautifulSoup
-from feedgen.feed import FeedGenerator
-from typing import Dict, Any
+import lxml.html
+from lxml import etree
+from bs4 import BeautifulSoup, SoupStrainer
+from typing import Dict, Any, Optional, Tuple
 
 # ───── CONFIGURATION ─────
 SOURCE_FEED = "https://www.goodreads.com/user/updates_rss/14857928"
 TWITTER_OUTPUT = "cleaned_goodreads_twitter.xml"
 THREADS_OUTPUT = "cleaned_goodreads_threads.xml"
+STATE_FILE = ".feedstate.json"  # ETag / Last-Modified of the last fetch
+ENTRY_CACHE_FILE = ".entry_cache.json"  # rendered texts per entry
+CACHE_VERSION = 1  # bump whenever the rendered text format changes
+ATOM_NS = "http://www.w3.org/2005/Atom"
 # ─────────────────────────
 
+# Activity we never post, rejected before anything else is looked at
+_SKIP_PREFIXES = (
+    "Julien liked",
+    "Julien wants to read",
+    "Julien added a quote",
+    "Julien is friends with",
+    "Julien voted",
+    "Julien rated",
+)
+# Titles that can reach _RE_CLASSIFY (besides "% done with" progress updates)
+_HANDLE_PREFIXES = (
+    "Julien finished reading '",
+    "Julien is currently reading '",
+    "Julien started reading '",
+    "Julien added '",
+    "Julien reviewed '",
+)
+
+# Compiled once at import; used for every entry.
+# Title classifier, one engine pass per entry. Branch order is the dispatch
+# order; the progress branch scans from the start like re.search would.
+_RE_CLASSIFY = re.compile(
+    r"Julien (?:(?P<fin>finished reading ')|(?P<start>(?:is currently|started) reading '))"
+    r"|.*?(?P<pct>\d+)% done with (?P<pctrest>.+)"
+    r"|Julien (?P<add>(?:added|reviewed) ')",
+    re.S,
+)
+_RE_PAREN = re.compile(r"\s*\(.*?\)")
+_RE_STARS = re.compile(r"gave (\d+) stars")
+_RE_IMG_BY = re.compile(r" by ")
+_RE_HASHTAG = re.compile(r"[^A-Za-z0-9]+")
+_RE_BOOKTITLE = re.compile(r'<a[^>]*class="bookTitle"[^>]*>(.*?)</a>', re.S)
+_RE_AUTHOR = re.compile(r'<a[^>]*class="authorName"[^>]*>(.*?)</a>', re.S)
+_RE_IMG_ALT = re.compile(r'<img[^>]*\balt="([^"]+ by [^"]+)"')
+_RE_STRIP_TAGS = re.compile(r"<[^>]+>")
+
+# Every 20-cell progress bar, indexed by filled cells (one per 5%)
+_BARS = tuple("▓" * i + "░" * (20 - i) for i in range(21))
+
+# Start/progress/finish bodies only need the book/author links and cover image
+_STRAINER_READING = SoupStrainer(["a", "img"])
+
+@dataclass(slots=True, frozen=True)
+class BookMeta:
+    """What the parse_* helpers pull out of an entry body."""
+    book: str
+    author: str
+    rating: Optional[int] = None
+    snippet: str = ""
+
+@lru_cache(maxsize=512)
 def clean_parenthetical(title: str) -> str:
-    return re.sub(r"\s*\(.*?\)", "", title or "").strip()
+    return _RE_PAREN.sub("", title or "").strip()
 
+@lru_cache(maxsize=512)
 def _sanitize_hashtag(s: str) -> str:
     # Remove spaces and punctuation for a simple hashtag
-    return re.sub(r"[^A-Za-z0-9]+", "", (s or ""))
+    return _RE_HASHTAG.sub("", (s or ""))
 
 def extract_html(entry: Dict[str, Any]) -> str:
     """
@@ -48,79 +112,191 @@ def extract_html(entry: Dict[str, Any]) -> str:
         return first.get("value") or first.get("content") or ""
     return entry.get("summary") or entry.get("description") or ""
 
-def parse_reviews(html: str, max_length: int):
-    soup = BeautifulSoup(html or "", "html.parser")
-    book_tag = soup.find("a", class_="bookTitle")
-    author_tag = soup.find("a", class_="authorName")
-    raw_title = book_tag.get_text(strip=True) if book_tag else ""
-    author = author_tag.get_text(strip=True) if author_tag else ""
-    book = clean_parenthetical(raw_title)
-
-    rating = None
-    text = soup.get_text("\n", strip=True)
-    m = re.search(r"gave (\d+) stars", text)
-    if m:
-        try:
+def _parse_rating(html: str) -> Optional[int]:
+    """
+    Find "gave N stars" in the raw HTML with plain string scanning, so the
+    whole document never has to be materialised as text just for the rating.
+    """
+    idx = html.find("gave ")
+    while idx >= 0:
+        start = end = idx + 5
+        while end < len(html) and html[end].isdecimal():
+            end += 1
+        if end > start and html.startswith(" stars", end):
+            return int(html[start:end])
+        idx = html.find("gave ", end)
+    return None
+
+def _clean_inner(s: str) -> str:
+    # get_text(strip=True) stand-in for a regex-captured element body
+    return html_lib.unescape(_RE_STRIP_TAGS.sub("", s)).strip()
+
+def _review_tree(html: str):
+    return lxml.html.fragment_fromstring(html or "", create_parent="div")
+
+def _class_text(tree, cls: str) -> str:
+    # Same result as bs4's find("a", class_=cls).get_text(strip=True)
+    found = tree.xpath(".//a[contains(concat(' ', normalize-space(@class), ' '), $c)]", c=f" {cls} ")
+    if not found:
+        return ""
+    return "".join(t.strip() for t in found[0].itertext())
+
+def _collapse_ws(chunks, limit: int) -> str:
+    """
+    Join text chunks with single spaces, collapsing whitespace runs inline.
+    Stops once `limit + 1` characters are collected: enough for `_snippet`
+    to cut at `limit` and still tell that more text followed.
+    """
+    out = []
+    pending_space = False
+    for chunk in chunks:
+        for ch in chunk:
+            if ch.isspace():
+                pending_space = bool(out)
+                continue
+            if pending_space:
+                out.append(" ")
+                pending_space = False
+                if len(out) > limit:
+                    return "".join(out)
+            out.append(ch)
+            if len(out) > limit:
+                return "".join(out)
+        pending_space = bool(out)
+    return "".join(out)
+
+def _parse_review_core(tree, html: str, limit: int):
+    """
+    Extract book, author, rating and the whitespace-collapsed review text
+    from an already-parsed review body (`tree` from `_review_tree(html)`).
+    The text is only collected up to `limit`, the longest snippet needed;
+    snippets are then sliced from it with `_snippet`.
+    """
+    # Regex + _clean_inner first, as in parse_reading; XPath only if markup differs
+    bt = _RE_BOOKTITLE.search(html)
+    at = _RE_AUTHOR.search(html)
+    author = _clean_inner(at.group(1)) if at else _class_text(tree, "authorName")
+    book = clean_parenthetical(_clean_inner(bt.group(1)) if bt else _class_text(tree, "bookTitle"))
+
+    rating = _parse_rating(html)
+    if rating is None and "gave " in html:
+        # Markup between "gave" and the digits; fall back to the text walk
+        m = _RE_STARS.search(tree.text_content())
+        if m:
             rating = int(m.group(1))
-        except ValueError:
-            rating = None
-
-    snippet = ""
-    first_br = soup.find("br")
-    if first_br:
-        full = ""
-        for node in first_br.next_siblings:
-            if isinstance(node, str):
-                chunk = node.strip()
-                if chunk:
-                    full += chunk + " "
-            elif hasattr(node, "get_text"):
-                chunk = node.get_text(" ", strip=True).strip()
-                if chunk:
-                    full += chunk + " "
-            if len(full) > max_length * 2:
-                break
-        cleaned = re.sub(r"\s+", " ", full).strip()
-        if cleaned:
-            snippet = cleaned[:max_length].rstrip()
-            if len(cleaned) > max_length:
-                snippet += "..."
-
-    return {"book": book, "author": author, "rating": rating, "snippet": snippet}
 
-def parse_reading(html: str):
-    soup = BeautifulSoup(html or "", "html.parser")
+    # Review body is everything after the first <br>, collected in one XPath call
+    following = tree.xpath("(.//br)[1]/following::text()")
+    cleaned = _collapse_ws(following, limit)
+
+    return book, sys.intern(author), rating, cleaned
+
+def _snippet(cleaned: str, max_length: int) -> str:
+    if not cleaned:
+        return ""
+    snippet = cleaned[:max_length].rstrip()
+    if len(cleaned) > max_length:
+        snippet += "..."
+    return snippet
+
+def parse_reviews(html: str, max_length: int):
+    book, author, rating, cleaned = _parse_review_core(_review_tree(html), html or "", max_length)
+    return BookMeta(book, author, rating, _snippet(cleaned, max_length))
+
+def _parse_reading_bs4(html: str):
+    soup = BeautifulSoup(html or "", "lxml", parse_only=_STRAINER_READING)
     bt = soup.find("a", class_="bookTitle")
     at = soup.find("a", class_="authorName")
     book = clean_parenthetical(bt.get_text(strip=True) if bt else "")
     author = (at.get_text(strip=True) if at else "")
-    return {"book": book, "author": author}
+    return BookMeta(book, sys.intern(author))
+
+def parse_reading(html: str):
+    """
+    Goodreads' markup for these fields is fixed, so plain regexes find them
+    without building a tree; BeautifulSoup is only used if neither matches.
+    """
+    html = html or ""
+    bt = _RE_BOOKTITLE.search(html)
+    at = _RE_AUTHOR.search(html)
+    if not (bt or at):
+        return _parse_reading_bs4(html)
+    book = clean_parenthetical(_clean_inner(bt.group(1)) if bt else "")
+    author = _clean_inner(at.group(1)) if at else ""
+    return BookMeta(book, sys.intern(author))
 
 def parse_progress(html: str):
-    soup = BeautifulSoup(html or "", "html.parser")
-    img = soup.find("img", alt=re.compile(r" by "))
-    if img and img.has_attr("alt"):
-        parts = img["alt"].split(" by ", 1)
-        if len(parts) == 2:
-            return {"book": clean_parenthetical(parts[0]), "author": parts[1].strip()}
+    m = _RE_IMG_ALT.search(html or "")
+    if m:
+        book, author = html_lib.unescape(m.group(1)).split(" by ", 1)
+        return BookMeta(clean_parenthetical(book), sys.intern(author.strip()))
+    if "<img" in (html or ""):
+        # Unusual attribute quoting/order; let BeautifulSoup have a look
+        soup = BeautifulSoup(html, "lxml", parse_only=_STRAINER_READING)
+        img = soup.find("img", alt=_RE_IMG_BY)
+        if img and img.has_attr("alt"):
+            parts = img["alt"].split(" by ", 1)
+            if len(parts) == 2:
+                return BookMeta(clean_parenthetical(parts[0]), sys.intern(parts[1].strip()))
     return parse_reading(html)
 
-def build_progress_bar(percent: float, length: int = 20) -> str:
-    filled = int(math.floor((percent / 100.0) * length))
-    filled = max(0, min(length, filled))
-    empty = length - filled
-    pct = f"{percent:.2f}%"
-    return "▓" * filled + "░" * empty + "  " + pct
-
-def make_feed(feed_title: str, self_link: str):
-    fg = FeedGenerator()
-    fg.id(SOURCE_FEED)
-    fg.title(feed_title)
-    fg.author({"name": "Julien"})
-    fg.link(href=SOURCE_FEED, rel="alternate")
-    fg.link(href=self_link, rel="self")
-    fg.language("en")
-    return fg
+def build_progress_bar(percent: float) -> str:
+    return f"{_BARS[max(0, min(20, int(percent // 5)))]}  {percent:.2f}%"
+
+@dataclass
+class _EntryData:
+    """Fields shared by the Twitter and Threads copies of one output entry."""
+    guid: str
+    title: str
+    link: str
+    updated_dt: datetime.datetime
+    txt_tw: str
+    txt_th: str
+
+def _atom_elem(tag: str, text: Optional[str] = None, parent=None, **attrib):
+    # Written inside <feed xmlns=ATOM_NS>, so plain tag names land in the Atom namespace
+    elem = etree.Element(tag, attrib) if parent is None else etree.SubElement(parent, tag, attrib)
+    if text is not None:
+        elem.text = text
+    return elem
+
+def _feed_header(feed_title: str, self_link: str, updated: datetime.datetime):
+    yield _atom_elem("id", SOURCE_FEED)
+    yield _atom_elem("title", feed_title)
+    yield _atom_elem("updated", updated.isoformat())
+    author = _atom_elem("author")
+    _atom_elem("name", "Julien", author)
+    yield author
+    yield _atom_elem("link", href=SOURCE_FEED, rel="alternate")
+    yield _atom_elem("link", href=self_link, rel="self")
+
+def _entry_elem(item: _EntryData, id_suffix: str, content: str):
+    e = _atom_elem("entry")
+    _atom_elem("id", item.guid + id_suffix, e)
+    _atom_elem("title", item.title, e)
+    _atom_elem("updated", item.updated_dt.isoformat(), e)
+    if item.link:
+        _atom_elem("link", parent=e, href=item.link, rel="alternate")
+    _atom_elem("content", content, e, type="text")
+    return e
+
+def write_feed(path: str, feed_title: str, updated: datetime.datetime,
+               items, id_suffix: str, text_attr: str) -> None:
+    """
+    Stream an Atom feed to `path`, one element at a time, so the document is
+    never held in memory whole. `text_attr` names the _EntryData field used
+    as each entry's content; entries are written newest first.
+    """
+    with open(path, "wb") as f:
+        with etree.xmlfile(f, encoding="UTF-8") as xf:
+            xf.write_declaration()
+            with xf.element(f"{{{ATOM_NS}}}feed", {"xml:lang": "en"}, nsmap={None: ATOM_NS}):
+                entries = (_entry_elem(item, id_suffix, getattr(item, text_attr)) for item in reversed(items))
+                for elem in chain(_feed_header(feed_title, path, updated), entries):
+                    etree.indent(elem, level=1)
+                    xf.write("\n  ", elem)
+                xf.write("\n")
+        f.write(b"\n")
 
 def to_dt(entry: Dict[str, Any]) -> datetime.datetime:
     """
@@ -135,9 +311,145 @@ def to_dt(entry: Dict[str, Any]) -> datetime.datetime:
             pass
     return datetime.datetime.now(tz=timezone.utc)
 
-def main():
-    cache_bust = f"?nocache={int(time.time())}"
-    src = feedparser.parse(SOURCE_FEED + cache_bust)
+def _classify(title: str) -> Optional[re.Match]:
+    """Return the _RE_CLASSIFY match for a title we post, else None."""
+    if not title.startswith(_HANDLE_PREFIXES) and "% done with" not in title:
+        return None
+    return _RE_CLASSIFY.match(title)
+
+def _build_texts(m: re.Match, link: str, html: str) -> Tuple[str, str]:
+    """
+    Render the Twitter and Threads texts for one entry classified as `m`.
+    Pure function of the entry's title, link and HTML, which is what makes
+    the results safe to cache.
+    """
+    if m.group("fin"):
+        d = parse_reading(html)
+        lines = [
+            f"📘 Finished “{d.book}” by {d.author}",
+            f"🔗 {link}",
+            f"🏷️ #{_sanitize_hashtag(d.author)}"
+        ]
+        txt_tw = txt_th = "\n".join(lines)
+
+    elif m.group("start"):
+        d = parse_reading(html)
+        lines = [
+            f"🚀 Starting “{d.book}” by {d.author}",
+            f"🔗 Follow my progress: {link}",
+            f"🏷️ #{_sanitize_hashtag(d.author)} #NowReading"
+        ]
+        txt_tw = txt_th = "\n".join(lines)
+
+    elif m.group("pct"):
+        try:
+            pct = float(m.group("pct"))
+        except ValueError:
+            pct = 0.0
+        d = parse_progress(html)
+        bar = build_progress_bar(pct)
+        lines = [
+            f"📈 I’ve read {int(pct)}% of “{d.book}” by {d.author}",
+            bar,
+            f"🔗 Progress: {link}",
+            f"🏷️ #{_sanitize_hashtag(d.author)} #ReadingProgress"
+        ]
+        txt_tw = txt_th = "\n".join(lines)
+
+    elif m.group("add"):
+        # Parse once; only the snippet length differs between feeds
+        tree = _review_tree(html)
+        book, author, rating, cleaned = _parse_review_core(tree, html or "", 500)
+        tw_snip = _snippet(cleaned, 200)
+        th_snip = _snippet(cleaned, 500)
+
+        lines_tw = [f"📚 “{book}” by {author}"]
+        if rating is not None:
+            lines_tw.append(f"⭐️ Rated: {rating}/5")
+        if tw_snip:
+            lines_tw.append(f"📝 \"{tw_snip}\"")
+        lines_tw.append(f"🏷️ #{_sanitize_hashtag(author)}")
+        txt_tw = "\n".join(lines_tw)
+
+        lines_th = [f"📚 “{book}” by {author}"]
+        if rating is not None:
+            lines_th.append(f"⭐️ Rated: {rating}/5")
+        if th_snip:
+            lines_th.append(f"📝 \"{th_snip}\"")
+        lines_th.append(f"🏷️ #{_sanitize_hashtag(author)}")
+        txt_th = "\n".join(lines_th)
+
+    else:
+        raise ValueError(f"unexpected classification: {m.group(0)!r}")
+
+    return txt_tw, txt_th
+
+def _render_job(job) -> Optional[Tuple[str, str]]:
+    """Thread-pool worker around _build_texts; errors skip just that entry."""
+    m, link, entry = job
+    try:
+        # Body is only pulled for entries we actually render
+        return _build_texts(m, link, extract_html(entry))
+    except Exception as e:
+        print(f"⚠️  Skipped entry due to error: {(entry.get('title') or 'Untitled')} — {e}")
+        return None
+
+def _read_json(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+def load_feed_state() -> Dict[str, Any]:
+    """
+    Return the validators saved by the previous run, or {} if there are none.
+    They are ignored while an output file is missing, so it is rebuilt.
+    """
+    if not (os.path.exists(TWITTER_OUTPUT) and os.path.exists(THREADS_OUTPUT)):
+        return {}
+    return _read_json(STATE_FILE)
+
+def save_feed_state(src) -> None:
+    _write_json(STATE_FILE, {"etag": src.get("etag"), "modified": src.get("modified")})
+
+def load_entry_cache() -> Dict[str, Dict[str, str]]:
+    """
+    Return rendered texts from the previous run, keyed by "guid|updated".
+    A cache written by a different CACHE_VERSION is discarded.
+    """
+    data = _read_json(ENTRY_CACHE_FILE)
+    if data.get("version") != CACHE_VERSION:
+        return {}
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+def save_entry_cache(cache: Dict[str, Dict[str, str]]) -> None:
+    _write_json(ENTRY_CACHE_FILE, {"version": CACHE_VERSION, "entries": cache})
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the cleaned Twitter/Threads feeds from Goodreads.")
+    parser.add_argument(
+        "--force", action="store_true",
+        help="skip HTTP caching: no ETag/Last-Modified, and a cache-busting query string",
+    )
+    args = parser.parse_args(argv)
+
+    if args.force:
+        src = feedparser.parse(f"{SOURCE_FEED}?nocache={int(time.time())}")
+    else:
+        # Plain URL so Goodreads/CDN caches and our conditional GET both apply
+        state = load_feed_state()
+        src = feedparser.parse(SOURCE_FEED, etag=state.get("etag"), modified=state.get("modified"))
+
+    if getattr(src, "status", None) == 304:
+        print("✅ Feed not modified since last run; outputs left as-is.")
+        return
 
     if src.bozo:
         print("❌ Error parsing feed:", src.bozo_exception, file=sys.stderr)
@@ -145,138 +457,79 @@ def main():
         if not getattr(src, "entries", None):
             sys.exit(1)
 
-    entries = list(getattr(src, "entries", []))
+    entries = getattr(src, "entries", None) or []
     print(f"✅ Fetched {len(entries)} entries.")
 
-    fg_tw = make_feed("Julien’s Goodreads → Twitter Feed", TWITTER_OUTPUT)
-    fg_th = make_feed("Julien’s Goodreads → Threads Feed", THREADS_OUTPUT)
-
-    if entries:
-        fg_tw.updated(to_dt(entries[0]))
-        fg_th.updated(to_dt(entries[0]))
-
-    count_tw = count_th = 0
+    cache = load_entry_cache()
+    handled = []  # (key, guid, title, link, entry), oldest → newest
+    jobs = {}  # key → (match, link, entry) for entries the cache doesn't cover
 
     # Process oldest → newest (stable ordering in output)
-    for entry in reversed(entries):
+    for i in range(len(entries) - 1, -1, -1):
+        entry = entries[i]
         try:
             title = (entry.get("title") or "").strip()
             link = entry.get("link") or ""
-            html = extract_html(entry)
 
             # Skip activity types we don't care about (and which often lack body)
             if not title:
                 print("⚠️  Skipped entry: (no title)")
                 continue
-            if any(
-                title.startswith(prefix) for prefix in [
-                    "Julien liked a review",
-                    "Julien liked",
-                    "Julien wants to read",
-                    "Julien added a quote",
-                    "Julien is friends with",
-                ]
-            ):
+            if title.startswith(_SKIP_PREFIXES):
                 print(f"⚠️  Skipped entry (activity): {title}")
                 continue
-
-            # Classify
-            txt_tw = txt_th = None
-
-            if re.match(r"Julien finished reading '", title):
-                d = parse_reading(html)
-                lines = [
-                    f"📘 Finished “{d['book']}” by {d['author']}",
-                    f"🔗 {link}",
-                    f"🏷️ #{_sanitize_hashtag(d['author'])}"
-                ]
-                txt_tw = txt_th = "\n".join(lines)
-
-            elif re.match(r"Julien (?:is currently|started) reading '", title):
-                d = parse_reading(html)
-                lines = [
-                    f"🚀 Starting “{d['book']}” by {d['author']}",
-                    f"🔗 Follow my progress: {link}",
-                    f"🏷️ #{_sanitize_hashtag(d['author'])} #NowReading"
-                ]
-                txt_tw = txt_th = "\n".join(lines)
-
-            elif (m := re.search(r"(\d+)% done with (.+)", title)):
-                try:
-                    pct = float(m.group(1))
-                except ValueError:
-                    pct = 0.0
-                d = parse_progress(html)
-                bar = build_progress_bar(pct)
-                lines = [
-                    f"📈 I’ve read {int(pct)}% of “{d['book']}” by {d['author']}",
-                    bar,
-                    f"🔗 Progress: {link}",
-                    f"🏷️ #{_sanitize_hashtag(d['author'])} #ReadingProgress"
-                ]
-                txt_tw = txt_th = "\n".join(lines)
-
-            elif re.match(r"Julien added '", title) or re.match(r"Julien reviewed '", title):
-                tw = parse_reviews(html, 200)
-                th = parse_reviews(html, 500)
-
-                lines_tw = [f"📚 “{tw['book']}” by {tw['author']}"]
-                if tw["rating"] is not None:
-                    lines_tw.append(f"⭐️ Rated: {tw['rating']}/5")
-                if tw["snippet"]:
-                    lines_tw.append(f"📝 \"{tw['snippet']}\"")
-                lines_tw.append(f"🏷️ #{_sanitize_hashtag(tw['author'])}")
-                txt_tw = "\n".join(lines_tw)
-
-                lines_th = [f"📚 “{th['book']}” by {th['author']}"]
-                if th["rating"] is not None:
-                    lines_th.append(f"⭐️ Rated: {th['rating']}/5")
-                if th["snippet"]:
-                    lines_th.append(f"📝 \"{th['snippet']}\"")
-                lines_th.append(f"🏷️ #{_sanitize_hashtag(th['author'])}")
-                txt_th = "\n".join(lines_th)
-
-            else:
+            m = _classify(title)
+            if m is None:
                 print(f"⚠️  Skipped entry (unhandled type): {title}")
                 continue
 
-            # Build entries
             guid = entry.get("guid") or entry.get("id") or (link or title)
-            updated_dt = to_dt(entry)
-
-            # Twitter feed
-            e_tw = fg_tw.add_entry()
-            e_tw.id(str(guid) + "-tw")
-            e_tw.title(title)
-            if link:
-                e_tw.link(href=link, rel="alternate")
-            e_tw.updated(updated_dt)
-            e_tw.content(txt_tw or "", type="text")
-            count_tw += 1
-
-            # Threads feed
-            e_th = fg_th.add_entry()
-            e_th.id(str(guid) + "-th")
-            e_th.title(title)
-            if link:
-                e_th.link(href=link, rel="alternate")
-            e_th.updated(updated_dt)
-            e_th.content(txt_th or "", type="text")
-            count_th += 1
+            key = f"{guid}|{entry.get('updated') or entry.get('published') or ''}"
+            if key not in cache:
+                jobs[key] = (m, link, entry)
+            handled.append((key, guid, title, link, entry))
 
         except Exception as e:
             print(f"⚠️  Skipped entry due to error: {(entry.get('title') or 'Untitled')} — {e}")
             continue
 
-    print(f"✅ Built {count_tw} Twitter entries, {count_th} Threads entries.")
+    # Entries render independently, and lxml releases the GIL while parsing
+    rendered = {}
+    if jobs:
+        with ThreadPoolExecutor(max_workers=min(8, len(jobs))) as pool:
+            rendered = dict(zip(jobs, pool.map(_render_job, jobs.values())))
+
+    next_cache = {}  # only entries still in the feed, so the file stays bounded
+    items = []
+    for key, guid, title, link, entry in handled:
+        if key in cache:
+            txt_tw, txt_th = cache[key]["tw"], cache[key]["th"]
+        elif rendered[key] is not None:
+            txt_tw, txt_th = rendered[key]
+        else:
+            continue
+        next_cache[key] = {"tw": txt_tw, "th": txt_th}
+        items.append(_EntryData(
+            guid=str(guid),
+            title=title,
+            link=link,
+            updated_dt=to_dt(entry),
+            txt_tw=txt_tw or "",
+            txt_th=txt_th or "",
+        ))
+
+    print(f"✅ Built {len(items)} Twitter entries, {len(items)} Threads entries.")
 
-    with open(TWITTER_OUTPUT, "wb") as f:
-        f.write(fg_tw.atom_str(pretty=True))
+    feed_updated = to_dt(entries[0]) if entries else datetime.datetime.now(tz=timezone.utc)
+
+    write_feed(TWITTER_OUTPUT, "Julien’s Goodreads → Twitter Feed", feed_updated, items, "-tw", "txt_tw")
     print(f"✅ Wrote {TWITTER_OUTPUT}")
 
-    with open(THREADS_OUTPUT, "wb") as f:
-        f.write(fg_th.atom_str(pretty=True))
+    write_feed(THREADS_OUTPUT, "Julien’s Goodreads → Threads Feed", feed_updated, items, "-th", "txt_th")
     print(f"✅ Wrote {THREADS_OUTPUT}")
 
+    save_entry_cache(next_cache)
+    save_feed_state(src)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file